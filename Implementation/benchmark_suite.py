@@ -0,0 +1,310 @@
+"""
+Performance Regression Suite for the Fibonacci Implementations
+
+Name: Siddharth Kakked
+Date: 19th October 2026
+Re-runs a fixed subset of n values for every algorithm and compares the results
+with the committed baseline CSVs (timings_<lang>_data.csv, ops_<lang>_data.csv).
+
+Timings are scaled by a calibration run so a slower or faster machine (or
+interpreter) does not look like a regression. The calibration is a frozen copy
+of the three python kernels that produced timings_py_data.csv, run in a fresh
+interpreter exactly like the baseline runs, just before and just after each n
+is measured. For each n and algorithm, the median cost per operation of those
+calibration runs, divided by the baseline's cost per operation (median over
+the committed rows within CAL_WINDOW of n), is the machine factor. Costs per
+operation grow with n (bigger integers, bigger caches), so both sides are taken
+at the same n, and a machine that slows down part way through the sweep is
+still compared fairly. Because the copy lives in this file, a slowdown in
+fibonacci.py itself does not move the factor. The python baseline is the
+reference for the C baseline too, since both were recorded on the same machine.
+
+Exit codes:
+    0 = no regressions
+    1 = at least one timing regression (beyond the statistical tolerance)
+    2 = operation counts drifted from the baseline (hard failure)
+
+Sample execution:
+    python3 benchmark_suite.py --lang py --exec "python3 fibonacci.py"
+    python3 benchmark_suite.py --lang c --exec ./fibonacci
+"""
+import argparse
+import csv
+import statistics
+import subprocess
+import sys
+
+import test_runner
+from test_runner import RecursionTimeoutError, run_single
+
+SUITE_N = [11, 21, 25, 501, 1001, 2001, 4999]  # Present in both the python (odd N) and C baselines
+RECURSIVE_MAX = 25                # Largest n the recursive algorithm is re-run for
+REPEATS = 5                       # Runs per n, summarized by the median
+REL_TOL = 0.4                     # Allowed slowdown relative to the scaled baseline
+ABS_TOL = 0.0001                  # Allowed slowdown in seconds (timer resolution/process noise)
+MAD_Z = 3.0                       # Allowed slowdown in robust standard deviations of the repeats
+CAL_REPEATS = 3                   # Calibration runs before and after each n
+CAL_WINDOW = 0.2                  # Baseline rows within 20% of n form the reference
+BASELINE_TIME = "timings_{lang}_data.csv"   # Committed timing baselines
+BASELINE_OPS = "ops_{lang}_data.csv"        # Committed operation count baselines
+ALGORITHMS = test_runner.CSV_HEADER.split(",")[1:]  # Iterative, Dynamic Programming, Recursive
+
+
+def load_baseline(path: str) -> dict:
+    """
+    Loads a baseline CSV into a dictionary keyed by N.
+
+    Args:
+        path (str): baseline CSV with the test_runner header
+
+    Returns:
+        dict: {n: {algorithm: value string}}, "-" marks a skipped algorithm
+    """
+    with open(path, newline="") as f:
+        return {int(row["N"]): row for row in csv.DictReader(f)}
+
+
+# Frozen copy of the baseline python kernels, run in a fresh interpreter.
+# Prints the seconds per operation of each algorithm for one n, in ALGORITHMS
+# order; "-" when the recursive kernel is skipped.
+CAL_SCRIPT = """
+import sys, time
+from functools import lru_cache
+OPS = 0
+def iterative(n):
+    global OPS
+    result = []
+    if n >= 1:
+        result.append(1)
+    if n >= 2:
+        result.append(1)
+    for i in range(3, n + 1):
+        OPS += 1
+        result.append(result[-1] + result[-2])
+    return result
+@lru_cache(maxsize=None)
+def dp(n):
+    if n <= 1:
+        return n
+    global OPS
+    OPS += 1
+    return dp(n - 1) + dp(n - 2)
+def recursive(n):
+    if n <= 1:
+        return n
+    global OPS
+    OPS += 1
+    return recursive(n - 1) + recursive(n - 2)
+def series(n, func):
+    return [func(i) for i in range(1, n + 1)]
+def cost(func, n):
+    global OPS
+    OPS = 0
+    start = time.perf_counter()
+    func(n)
+    return (time.perf_counter() - start) / OPS
+n, with_recursive = int(sys.argv[1]), sys.argv[2] == "1"
+print(cost(iterative, n), cost(lambda n: series(n, dp), n),
+      cost(lambda n: series(n, recursive), n) if with_recursive else "-", sep=",")
+"""
+
+
+def baseline_op_cost(n: int) -> dict:
+    """
+    Cost of one operation of each algorithm around n on the baseline machine,
+    from the committed python baselines.
+
+    Args:
+        n (int): the nth fibonacci number
+
+    Returns:
+        dict: {algorithm: median seconds per operation over the rows within CAL_WINDOW of n}
+    """
+    times = load_baseline(BASELINE_TIME.format(lang="py"))
+    ops = load_baseline(BASELINE_OPS.format(lang="py"))
+    reference = {}
+    for algo in ALGORITHMS:
+        costs = [float(times[m][algo]) / int(ops[m][algo]) for m in times
+                 if abs(m - n) <= CAL_WINDOW * n and times[m][algo] != "-" and int(ops[m][algo]) > 0]
+        if costs:
+            reference[algo] = statistics.median(costs)
+    return reference
+
+
+def calibrate(n: int) -> dict:
+    """
+    Times the frozen kernels at n on this machine.
+
+    Args:
+        n (int): the nth fibonacci number
+
+    Returns:
+        dict: {algorithm: seconds per operation of CAL_REPEATS fresh runs}
+    """
+    recursive = "1" if n <= RECURSIVE_MAX else "0"
+    costs = {algo: [] for algo in ALGORITHMS}
+    for _ in range(CAL_REPEATS):
+        result = subprocess.run([sys.executable, "-c", CAL_SCRIPT, str(n), recursive],
+                                capture_output=True, text=True, check=True)
+        for algo, cost in zip(ALGORITHMS, result.stdout.strip().split(",")):
+            if cost != "-":
+                costs[algo].append(float(cost))
+    return costs
+
+
+def measure(n: int, repeats: int) -> tuple:
+    """
+    Runs the program repeatedly for one n.
+
+    Args:
+        n (int): the nth fibonacci number to generate
+        repeats (int): number of runs
+
+    Returns:
+        tuple: ({algorithm: [seconds per run]}, {algorithm: set of op counts})
+    """
+    # Recursive is exponential, only re-run it for small n
+    run_type = 3 if n <= RECURSIVE_MAX else 4
+    timings = {algo: [] for algo in ALGORITHMS}
+    operations = {algo: set() for algo in ALGORITHMS}
+
+    for _ in range(repeats):
+        result = run_single(n, run_type)
+        for algo, t, ops in zip(ALGORITHMS, result["timings"], result["operations"]):
+            if t != "-":
+                timings[algo].append(float(t))
+                operations[algo].add(ops)
+    return timings, operations
+
+
+def allowed_time(expected: float, samples: list) -> float:
+    """
+    Computes the slowest median that is still not a regression.
+
+    Args:
+        expected (float): baseline time scaled to this machine
+        samples (list): measured times for this n
+
+    Returns:
+        float: expected time plus the largest of the tolerances
+    """
+    median = statistics.median(samples)
+    mad = statistics.median(abs(t - median) for t in samples)
+    # 1.4826 * MAD estimates the standard deviation for normal noise
+    return expected + max(REL_TOL * expected, ABS_TOL, MAD_Z * 1.4826 * mad)
+
+
+def compare(algo: str, n: int, base_time: str, base_ops: str,
+            timings: list, operations: set, factor: float) -> tuple:
+    """
+    Compares one algorithm at one n with its baseline.
+
+    Args:
+        algo (str): algorithm name
+        n (int): the nth fibonacci number
+        base_time (str): baseline time from the CSV
+        base_ops (str): baseline operation count from the CSV
+        timings (list): measured times
+        operations (set): measured operation counts (as strings)
+        factor (float): machine factor from the calibration
+
+    Returns:
+        tuple: (status, report line); status is "ok", "REGRESSION" or "OPS DRIFT"
+    """
+    # Operation counts are deterministic, any change is a hard failure
+    if operations != {base_ops}:
+        return "OPS DRIFT", f"{algo},{n},ops {base_ops},-,ops {'/'.join(sorted(operations))},-,OPS DRIFT"
+
+    expected = float(base_time) * factor
+    median = statistics.median(timings)
+    allowed = allowed_time(expected, timings)
+    status = "REGRESSION" if median > allowed else "ok"
+    return status, f"{algo},{n},{float(base_time):0.6f},{expected:0.6f},{median:0.6f},{allowed:0.6f},{status}"
+
+
+def main(lang: str, repeats: int = REPEATS) -> int:
+    """
+    Runs the suite and prints one line per algorithm and n.
+
+    Args:
+        lang (str): baseline language ("py" or "c")
+        repeats (int): runs per n
+
+    Returns:
+        int: exit code (0 = pass, 1 = timing regression, 2 = op count drift)
+    """
+    baseline_time = load_baseline(BASELINE_TIME.format(lang=lang))
+    baseline_ops = load_baseline(BASELINE_OPS.format(lang=lang))
+
+    print("Algorithm,N,Baseline,Expected,Median,Allowed,Status")
+    regressions = 0
+    drifts = 0
+    for n in SUITE_N:
+        reference = baseline_op_cost(n)
+        before = calibrate(n)
+        try:
+            timings, operations = measure(n, repeats)
+        except RecursionTimeoutError as e:
+            print(e, file=sys.stderr)
+            regressions += 1
+            continue
+        after = calibrate(n)
+
+        for algo in ALGORITHMS:
+            base_t = baseline_time[n][algo]
+            if base_t == "-" or not timings[algo]:
+                continue
+
+            # Scale factor from the baseline machine to this one, at this n
+            factor = statistics.median(before[algo] + after[algo]) / reference[algo]
+            status, line = compare(algo, n, base_t, baseline_ops[n][algo],
+                                   timings[algo], operations[algo], factor)
+            drifts += status == "OPS DRIFT"
+            regressions += status == "REGRESSION"
+            print(line)
+
+    print(f"{regressions} timing regression(s), {drifts} op count drift(s)")
+    if drifts:
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the fibonacci programs against the committed baseline CSVs"
+    )
+    parser.add_argument(
+        "--lang",
+        choices=["py", "c"],
+        default="py",
+        help="Which baseline CSVs to compare against (default: py)"
+    )
+    parser.add_argument(
+        "--exec",
+        type=str,
+        default=None,
+        help="Executable to run (default: 'python3 fibonacci.py' for py, test_runner default for c)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=REPEATS,
+        help=f"Runs per n value (default: {REPEATS})"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=test_runner.TIMEOUT,
+        help=f"Timeout in seconds for each run (default: {test_runner.TIMEOUT})"
+    )
+
+    args = parser.parse_args()
+
+    # Configure the shared runner used to launch the programs
+    test_runner.TIMEOUT = args.timeout
+    if args.exec:
+        test_runner.EXEC = args.exec
+    elif args.lang == "py":
+        test_runner.EXEC = f"{sys.executable} fibonacci.py"
+
+    sys.exit(main(args.lang, args.repeats))
@@ -6,29 +6,61 @@
     1. Iterative 
     2. Recursive 
     3. Dynamic Programming 
+ plus a parallel version of the recursive algorithm for benchmarking, and
+ fibonacci expressed as an instance of the linear recurrence engine.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from functools import lru_cache
+from functools import lru_cache, partial
+from itertools import islice
 import argparse
 from typing import Callable
+import os
 import sys
 import time
 
+from profiling import PROFILE_MODES, profile_call
+from recurrence import FIBONACCI
+import recurrence
+
 # Increase recursion limit to handle larger values
 sys.setrecursionlimit(100000)
 
 # Global variable to track number of operations
 OPS = 0
 
+# Cache state the DP algorithm is measured in (set by run_and_time)
+CACHE_MODE = None
+
+# Adjustment from the live cache_info to the statistics of the timed run:
+# (peak entries of cleared caches, hits offset, misses offset)
+CACHE_OFFSET = (0, 0, 0)
+
+# Parallel recursion settings
+WORKERS = os.cpu_count() or 1   # Size of the process pool
+SPLIT_FACTOR = 4                # Independent subtrees handed out per worker
+EXECUTOR = None                 # Started process pool, reused by fibonacci_r_parallel_full
+
 class FibonacciType(Enum):
     """Enumeration of Fibonacci algorithm types"""
+    RECURRENCE_SERIES = 9       # Recurrence engine, streaming series
+    RECURRENCE_TERM = 8         # Recurrence engine, single O(log n) term query
+    ITERATIVE_DP_PARALLEL = 7  # Iterative, DP and parallel recursive (serial recursive skipped)
+    ALL_PARALLEL = 6            # All three algorithms plus parallel recursive
+    RECURSIVE_PARALLEL = 5      # Recursion split across a process pool
     ITERATIVE_DP_TOGETHER = 4  # Run only iterative and DP for comparison
     ALL = 3                     # Run all three algorithms
     DP = 2                      # Dynamic programming only
     RECURSIVE = 1               # Pure recursion only
     ITERATIVE = 0               # Iterative only
 
+class CacheMode(Enum):
+    """Cache state the DP algorithm is measured in"""
+    COLD = "cold"               # Cache cleared once, reused across the series (default)
+    WARM = "warm"               # Cache already holds F(0)..F(n) when timing starts
+    PER_CALL = "per-call"       # Cache cleared before every number in the series
+
 @lru_cache(maxsize=None)
 def fibonacci_dp(n: int) -> int:
     """
@@ -71,6 +103,61 @@ def fibonacci_r(n: int) -> int:
     # Recursive call
     return fibonacci_r(n - 1) + fibonacci_r(n - 2)
 
+def _fibonacci_r_subtree(n: int) -> tuple:
+    """
+    Worker task for the parallel recursion: solves one subtree serially.
+
+    Args:
+        n: root of the subtree
+
+    Returns:
+        tuple: (fibonacci number, operations used by this subtree)
+    """
+    global OPS
+    OPS = 0  # Each worker process counts only its own subtree
+    value = fibonacci_r(n)
+    return value, OPS
+
+def fibonacci_r_parallel(n: int, executor: ProcessPoolExecutor) -> int:
+    """
+    Solves fibonacci using the same recursion as fibonacci_r, but expands the
+    top levels of the call tree here and hands the independent subtrees to a
+    process pool. Operation counts from the workers are merged back into OPS,
+    so the total matches fibonacci_r exactly.
+
+    Args:
+        n (int): nth fibonacci number (0-indexed)
+        executor: process pool that solves the subtrees
+
+    Returns:
+        nth fibonacci number
+    """
+    global OPS
+    result = 0
+    frontier = [n]
+    
+    # Expand level by level until there is enough work for every worker
+    while frontier and len(frontier) < WORKERS * SPLIT_FACTOR:
+        next_level = []
+        for m in frontier:
+            if m <= 1:
+                result += m  # Base case reached while splitting
+            else:
+                OPS += 1  # Same count as one call of fibonacci_r
+                next_level.extend((m - 1, m - 2))
+        frontier = next_level
+    
+    # Base cases left on the frontier need no worker
+    result += sum(m for m in frontier if m <= 1)
+    subtrees = [m for m in frontier if m > 1]
+    
+    # Solve the subtrees in parallel and merge values and operation counts
+    for value, ops in executor.map(_fibonacci_r_subtree, subtrees):
+        result += value
+        OPS += ops
+    
+    return result
+
 def fibonacci_series_recursive(n: int, func) -> list:
     """
     Calls the provided recursive function for each value from 1 to n.
@@ -83,6 +170,13 @@ def fibonacci_series_recursive(n: int, func) -> list:
         list of fibonacci numbers from F(1) to F(n)
     """
     result = []
+    # Checked once: an enum comparison per number costs as much as a DP step
+    if CACHE_MODE == CacheMode.PER_CALL and func is fibonacci_dp:
+        for i in range(1, n + 1):
+            clear_dp_cache()  # Every number starts from an empty cache
+            result.append(func(i))
+        return result
+
     # Generate each fibonacci number in sequence
     for i in range(1, n + 1):
         result.append(func(i))
@@ -168,8 +262,99 @@ def fibonacci_r_full(n: int) -> list:
     """
     return fibonacci_series_recursive(n, func=fibonacci_r)
 
+def start_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Starts a process pool and waits until its workers are running, so the
+    process spawn cost is paid before any timing starts.
+
+    Args:
+        workers: number of worker processes
+
+    Returns:
+        the ready process pool
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    # Workers are spawned lazily, one trivial task each brings them all up
+    list(executor.map(_fibonacci_r_subtree, [0] * workers))
+    return executor
+
+def fibonacci_r_parallel_full(n: int) -> list:
+    """
+    Generates fibonacci series from 1 to n using the parallel recursion.
+    Uses the pool in EXECUTOR (see start_pool), or a new pool of WORKERS
+    processes for this call only if none was started.
+    
+    Args:
+        n (int): the nth fibonacci number
+
+    Returns:
+        list of fibonacci numbers from F(1) to F(n)
+    """
+    if EXECUTOR is not None:
+        return fibonacci_series_recursive(n, func=partial(fibonacci_r_parallel, executor=EXECUTOR))
+    with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+        return fibonacci_series_recursive(n, func=partial(fibonacci_r_parallel, executor=executor))
+
+def fibonacci_recurrence(n: int) -> list:
+    """
+    Computes only F(n) with the linear recurrence engine (Kitamasa's method).
+    O(log n) polynomial steps instead of n additions.
+    
+    Args:
+        n (int): the nth fibonacci number
+
+    Returns:
+        list with the single value F(n), so it prints like the series functions
+    """
+    global OPS
+    recurrence.OPS = 0
+    result = [FIBONACCI.term(n)]
+    OPS += recurrence.OPS  # Count the engine's multiply-adds
+    return result
+
+def fibonacci_series_recurrence(n: int) -> list:
+    """
+    Generates fibonacci series from 1 to n by streaming the recurrence engine.
+    
+    Args:
+        n (int): the nth fibonacci number
+
+    Returns:
+        list of fibonacci numbers from F(1) to F(n)
+    """
+    global OPS
+    recurrence.OPS = 0
+    result = list(islice(FIBONACCI.series(), 1, n + 1))
+    OPS += recurrence.OPS
+    return result
+
+
+def dp_cache_footprint() -> tuple:
+    """
+    Reports the DP cache footprint of the last timed run.
+
+    Returns:
+        tuple: (entries, hits, misses) of the fibonacci_dp cache; entries is the
+               peak size, hits and misses count only the timed run (not the
+               WARM fill) and are summed over every number in PER_CALL mode
+    """
+    info = fibonacci_dp.cache_info()
+    peak, hits, misses = CACHE_OFFSET
+    return max(peak, info.currsize), info.hits + hits, info.misses + misses
+
+def clear_dp_cache():
+    """
+    Clears the DP cache in the middle of a timed run, keeping its statistics
+    for dp_cache_footprint.
+    """
+    global CACHE_OFFSET
+    # The counters restart from zero, so the offset becomes the totals so far
+    CACHE_OFFSET = dp_cache_footprint()
+    fibonacci_dp.cache_clear()
 
-def run_and_time(func: Callable, n: int, print_it: bool = False):
+def run_and_time(func: Callable, n: int, print_it: bool = False,
+                 profile: str = None, profile_dir: str = ".",
+                 cache_mode: CacheMode = CacheMode.COLD):
     """
     Runs the fibonacci generation function and measures execution time and operations.
     
@@ -177,25 +362,53 @@ def run_and_time(func: Callable, n: int, print_it: bool = False):
         func: function to run
         n (int): the nth fibonacci number
         print_it (bool): whether to print the result
+        profile (str): optional profiling mode ("cprofile" or "sample"); only the
+                       measured call is profiled, and the reported time then
+                       includes the profiler overhead
+        profile_dir (str): directory for profile_<func>_<n>.pstats/.collapsed
+        cache_mode (CacheMode): state of the DP cache during the measurement;
+                                the cache is always cleared first, WARM then
+                                fills it outside the timed region; see
+                                dp_cache_footprint for the statistics
 
     Returns:
         tuple: (execution_time, operations_count)
     """
-    global OPS
+    global OPS, CACHE_MODE, CACHE_OFFSET
+    fibonacci_dp.cache_clear()
+    if cache_mode == CacheMode.WARM:
+        # Fill F(0)..F(n) before timing, bottom-up so the recursion stays shallow
+        for i in range(n + 1):
+            fibonacci_dp(i)
+    # Only count cache hits and misses from here on
+    info = fibonacci_dp.cache_info()
+    CACHE_OFFSET = (0, -info.hits, -info.misses)
     OPS = 0  # Reset operation counter
     
-    # Measure execution time using high-resolution timer
-    start = time.perf_counter()
-    result = func(n)
-    end = time.perf_counter()
+    # The mode only applies to this run, plain calls afterwards use the cache normally
+    previous_mode, CACHE_MODE = CACHE_MODE, cache_mode
+    try:
+        if profile:
+            # Timed inside profile_call, writing the profile files is not included
+            out_prefix = os.path.join(profile_dir, f"profile_{func.__name__}_{n}")
+            result, elapsed = profile_call(func, n, profile, out_prefix)
+        else:
+            # Measure execution time using high-resolution timer
+            start = time.perf_counter()
+            result = func(n)
+            elapsed = time.perf_counter() - start
+    finally:
+        CACHE_MODE = previous_mode
     
     # Optionally print the generated series
     if print_it:
         print(result)
     
-    return end - start, OPS
+    return elapsed, OPS
 
-def main(n: int, algo: FibonacciType, print_it: bool):
+def main(n: int, algo: FibonacciType, print_it: bool,
+         profile: str = None, profile_dir: str = ".",
+         cache_mode: CacheMode = CacheMode.COLD, cache_report: bool = False):
     """
     Main execution function that runs the specified algorithm(s).
 
@@ -203,39 +416,101 @@ def main(n: int, algo: FibonacciType, print_it: bool):
         n: nth fibonacci number to generate
         algo: algorithm type to use
         print_it: whether to print the fibonacci series
+        profile: optional profiling mode passed to run_and_time
+        profile_dir: directory to write profiles to
+        cache_mode: DP cache state to measure in
+        cache_report: print a "cache,mode,entries,hits,misses" line after the CSV line
     """
+    global EXECUTOR
+    cache = None  # DP cache footprint (entries, hits, misses), if DP was run
+    
+    # Start the process pool outside the timed region
+    own_pool = EXECUTOR is None and algo in (FibonacciType.RECURSIVE_PARALLEL,
+                                             FibonacciType.ALL_PARALLEL,
+                                             FibonacciType.ITERATIVE_DP_PARALLEL)
+    if own_pool:
+        EXECUTOR = start_pool(WORKERS)
+    
     if algo == FibonacciType.RECURSIVE:
         # Run only recursive algorithm
         print("Recursive Version")
-        time_val, ops = run_and_time(fibonacci_r_full, n, print_it)
+        time_val, ops = run_and_time(fibonacci_r_full, n, print_it, profile=profile, profile_dir=profile_dir)
         print(f"Time: {time_val}({ops})")
         
     elif algo == FibonacciType.DP:
         # Run only dynamic programming algorithm
         print("Dynamic Programming Version")
-        time_val, ops = run_and_time(fibonacci_dp_full, n, print_it)
+        time_val, ops = run_and_time(fibonacci_dp_full, n, print_it, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
         print(f"Time: {time_val}({ops})")
         
     elif algo == FibonacciType.ITERATIVE_DP_TOGETHER:
         # Run iterative and DP for comparison (skip slow recursive)
-        time_val, ops = run_and_time(fibonacci_series_iterative, n)
-        time2, ops2 = run_and_time(fibonacci_dp_full, n)
+        time_val, ops = run_and_time(fibonacci_series_iterative, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(fibonacci_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
         # CSV format: time1,ops1,time2,ops2,-,- (placeholders for recursive)
         print(f"{time_val:0.6f},{ops},{time2:0.6f},{ops2},-,-")
         
+    elif algo == FibonacciType.RECURSIVE_PARALLEL:
+        # Run only the parallel recursive algorithm
+        print(f"Parallel Recursive Version ({WORKERS} workers)")
+        time_val, ops = run_and_time(fibonacci_r_parallel_full, n, print_it, profile=profile, profile_dir=profile_dir)
+        print(f"Time: {time_val}({ops})")
+        
+    elif algo == FibonacciType.RECURRENCE_TERM:
+        # Run only the recurrence engine single term query
+        print("Recurrence Engine Term Version")
+        time_val, ops = run_and_time(fibonacci_recurrence, n, print_it, profile=profile, profile_dir=profile_dir)
+        print(f"Time: {time_val}({ops})")
+        
+    elif algo == FibonacciType.RECURRENCE_SERIES:
+        # Run only the recurrence engine streaming series
+        print("Recurrence Engine Series Version")
+        time_val, ops = run_and_time(fibonacci_series_recurrence, n, print_it, profile=profile, profile_dir=profile_dir)
+        print(f"Time: {time_val}({ops})")
+        
+    elif algo == FibonacciType.ITERATIVE_DP_PARALLEL:
+        # Serial recursive timed out, keep measuring the parallel version
+        time_val, ops = run_and_time(fibonacci_series_iterative, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(fibonacci_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
+        time4, ops4 = run_and_time(fibonacci_r_parallel_full, n, profile=profile, profile_dir=profile_dir)
+        # CSV format: time1,ops1,time2,ops2,-,-,time4,ops4
+        print(f"{time_val:0.6f},{ops},{time2:0.6f},{ops2},-,-,{time4:0.6f},{ops4}")
+        
+    elif algo == FibonacciType.ALL_PARALLEL:
+        # Run all three algorithms plus the parallel recursive one
+        time_val, ops = run_and_time(fibonacci_series_iterative, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(fibonacci_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
+        time3, ops3 = run_and_time(fibonacci_r_full, n, profile=profile, profile_dir=profile_dir)
+        time4, ops4 = run_and_time(fibonacci_r_parallel_full, n, profile=profile, profile_dir=profile_dir)
+        # CSV format: time1,ops1,time2,ops2,time3,ops3,time4,ops4
+        print(f"{time_val:0.6f},{ops},{time2:0.6f},{ops2},{time3:0.6f},{ops3},{time4:0.6f},{ops4}")
+        
     elif algo == FibonacciType.ALL:
         # Run all three algorithms for complete comparison
-        time_val, ops = run_and_time(fibonacci_series_iterative, n)
-        time2, ops2 = run_and_time(fibonacci_dp_full, n)
-        time3, ops3 = run_and_time(fibonacci_r_full, n)
+        time_val, ops = run_and_time(fibonacci_series_iterative, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(fibonacci_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
+        time3, ops3 = run_and_time(fibonacci_r_full, n, profile=profile, profile_dir=profile_dir)
         # CSV format: time1,ops1,time2,ops2,time3,ops3
         print(f"{time_val:0.6f},{ops},{time2:0.6f},{ops2},{time3:0.6f},{ops3}")
         
     else:
         # Default: run only iterative algorithm
         print("Iterative Version")
-        time_val, ops = run_and_time(fibonacci_series_iterative, n, print_it)
+        time_val, ops = run_and_time(fibonacci_series_iterative, n, print_it, profile=profile, profile_dir=profile_dir)
         print(f"Time: {time_val}({ops})")
+    
+    # Second CSV line with the DP cache footprint for the test runner
+    if cache_report and cache is not None:
+        print(f"cache,{cache_mode.value},{cache[0]},{cache[1]},{cache[2]}")
+    
+    if own_pool:
+        EXECUTOR.shutdown()
+        EXECUTOR = None
 
 
 if __name__ == "__main__":
@@ -248,12 +523,47 @@ if __name__ == "__main__":
     parser.add_argument(
         "algo",
         type=int,
-        choices=[0, 1, 2, 3, 4],
+        choices=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
         default=FibonacciType.ITERATIVE.value,
-        help="The type of algorithm to use: 0 = iterative, 1 = recursive, 2 = dp, 3 = all, 4 = iterative and dp together",
+        help="The type of algorithm to use: 0 = iterative, 1 = recursive, 2 = dp, 3 = all, 4 = iterative and dp together, "
+             "5 = parallel recursive, 6 = all plus parallel recursive, 7 = iterative, dp and parallel recursive, "
+             "8 = recurrence engine term, 9 = recurrence engine series",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Number of processes for the parallel recursive algorithm (default: {WORKERS})",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=[mode.value for mode in CacheMode],
+        default=CacheMode.COLD.value,
+        help="DP cache state: cold = cleared before the run, warm = pre-filled, "
+             "per-call = cleared before every number (default: cold)",
+    )
+    parser.add_argument(
+        "--cache-report",
+        action="store_true",
+        default=False,
+        help="Print a cache,mode,entries,hits,misses line after the CSV output",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile the measured call: cprofile = deterministic, sample = low-overhead sampling",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=".",
+        help="Directory for profile_<algorithm>_<n>.pstats and .collapsed files (default: .)",
     )
 
     # Parse arguments and run
     args = parser.parse_args()
     algo = FibonacciType(args.algo)
-    main(args.n, algo, args.print)
+    WORKERS = args.workers
+    main(args.n, algo, args.print, args.profile, args.profile_dir,
+         CacheMode(args.cache), args.cache_report)
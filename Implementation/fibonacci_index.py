@@ -0,0 +1,165 @@
+"""
+Inverse Fibonacci Lookup and Zeckendorf Decomposition
+Name: Siddharth Kakked
+Date: 19th October 2026
+Answers the inverse questions without generating and scanning the series:
+    1. is_fibonacci(x) / index_of(x) - membership and index k with F(k) = x
+    2. zeckendorf(x)                  - greedy sum of non-consecutive fibonacci numbers
+Small values are found by binary search in a precomputed sorted table. Larger
+values use the estimate k ~ (log x + log sqrt(5)) / log(phi), with log x taken
+from the bit length, and confirm it with exact bigint terms from the recurrence
+engine, so every lookup is logarithmic.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import islice
+import math
+from typing import Iterable, List, Optional
+
+from recurrence import FIBONACCI
+
+TABLE_SIZE = 1000                      # Precompute F(0)..F(TABLE_SIZE) (about 700 bits)
+LOG_PHI = math.log((1 + math.sqrt(5)) / 2)
+LOG_SQRT5 = math.log(math.sqrt(5))
+LOG_2 = math.log(2)
+
+
+def estimate_index(x: int) -> int:
+    """
+    Estimates the index of the largest fibonacci number <= x from the bit length of x.
+    Off by at most one for x >= 1.
+
+    Args:
+        x: positive integer, any size
+
+    Returns:
+        estimated index k
+    """
+    # Keep the top 64 bits as a float and add the rest back as a power of two
+    shift = max(0, x.bit_length() - 64)
+    log_x = math.log(x >> shift) + shift * LOG_2
+    return max(1, int((log_x + LOG_SQRT5) / LOG_PHI))
+
+
+class FibonacciIndex:
+    """Sorted table of fibonacci numbers with logarithmic inverse lookups"""
+
+    def __init__(self, size: int = TABLE_SIZE):
+        """
+        Args:
+            size: largest index stored in the table (at least 2)
+        """
+        # table[k] = F(k); only F(1) = F(2) = 1 repeats, so the table stays sorted
+        self.table = list(islice(FIBONACCI.series(), max(2, size) + 1))
+
+    def _bracket(self, x: int) -> tuple:
+        """
+        Brackets an x beyond the table between two consecutive fibonacci numbers.
+
+        Args:
+            x: integer larger than the last table entry
+
+        Returns:
+            tuple: (k, F(k), F(k+1)) with F(k) <= x < F(k+1)
+        """
+        # Start from the estimate and correct it by stepping the pair, no further terms needed
+        k = estimate_index(x)
+        value, following = FIBONACCI.term(k), FIBONACCI.term(k + 1)
+        while value > x:
+            k -= 1
+            value, following = following - value, value
+        while following <= x:
+            k += 1
+            value, following = following, value + following
+        return k, value, following
+
+    def largest_at_most(self, x: int) -> tuple:
+        """
+        Finds the largest fibonacci number that does not exceed x.
+
+        Args:
+            x: positive integer
+
+        Returns:
+            tuple: (k, F(k)) with F(k) <= x < F(k+1); k >= 2 so 1 maps to F(2)
+        """
+        if x < 1:
+            raise ValueError(f"x must be positive, got {x}")
+        if x <= self.table[-1]:
+            k = bisect_right(self.table, x) - 1
+            return k, self.table[k]
+        k, value, _ = self._bracket(x)
+        return k, value
+
+    def index_of(self, x: int) -> Optional[int]:
+        """
+        Finds the index of a fibonacci number.
+
+        Args:
+            x: non-negative integer
+
+        Returns:
+            k with F(k) = x (the smallest one, so index_of(1) == 1),
+            or None if x is not a fibonacci number
+        """
+        if x < 0:
+            raise ValueError(f"x must be non-negative, got {x}")
+        if x <= self.table[-1]:
+            k = bisect_left(self.table, x)
+            return k if self.table[k] == x else None
+        k, value = self.largest_at_most(x)
+        return k if value == x else None
+
+    def is_fibonacci(self, x: int) -> bool:
+        """
+        Args:
+            x: non-negative integer
+
+        Returns:
+            True if x is a fibonacci number
+        """
+        return self.index_of(x) is not None
+
+    def zeckendorf(self, x: int) -> List[int]:
+        """
+        Greedy Zeckendorf decomposition: x as a sum of non-consecutive
+        fibonacci numbers, largest first. Beyond the table the terms are
+        bracketed once and then walked downwards with a, b = b, a - b, so
+        no term is recomputed.
+
+        Args:
+            x: non-negative integer
+
+        Returns:
+            indices k (descending, all >= 2) such that x = sum of F(k)
+        """
+        if x < 0:
+            raise ValueError(f"x must be non-negative, got {x}")
+        indices = []
+        if x > self.table[-1]:
+            k, value, following = self._bracket(x)
+            previous = following - value  # F(k-1)
+            while x > self.table[-1]:
+                if value <= x:
+                    indices.append(k)
+                    x -= value
+                k -= 1
+                value, previous = previous, value - previous
+
+        # The rest fits in the table
+        while x > 0:
+            k = bisect_right(self.table, x) - 1
+            indices.append(k)
+            x -= self.table[k]
+        return indices
+
+    def index_of_many(self, values: Iterable[int]) -> List[Optional[int]]:
+        """
+        Batch version of index_of.
+        """
+        return [self.index_of(x) for x in values]
+
+    def zeckendorf_many(self, values: Iterable[int]) -> List[List[int]]:
+        """
+        Batch version of zeckendorf.
+        """
+        return [self.zeckendorf(x) for x in values]
@@ -0,0 +1,211 @@
+"""
+Profiling Helpers for the Benchmark Scripts
+
+Name: Siddharth Kakked
+Date: 19th October 2026
+Profiles only the measured call (no argparse, no imports) in one of two modes:
+    1. cprofile - deterministic profile of every call
+    2. sample   - low-overhead SIGPROF sampling of the call stack
+Both modes write a .pstats file (readable with pstats/snakeviz) and a
+.collapsed file (one "frame;frame;frame count" line per stack, for flamegraphs).
+"""
+from collections import Counter, defaultdict
+import cProfile
+import os
+import pstats
+import signal
+import time
+
+PROFILE_MODES = ("cprofile", "sample")   # Supported profiling modes
+SAMPLE_INTERVAL = 0.001                   # Seconds of CPU time between samples
+
+
+def _label(func: tuple) -> str:
+    """
+    Builds a flamegraph frame label from a pstats function key.
+
+    Args:
+        func: (filename, line number, function name) as used by pstats
+
+    Returns:
+        readable frame label, e.g. "fibonacci_r (fibonacci.py:54)"
+    """
+    filename, line, name = func
+    if filename == "~":  # built-in functions have no source file
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _write_collapsed(stacks: Counter, path: str):
+    """
+    Writes stacks in the collapsed format used by flamegraph.pl and speedscope.
+
+    Args:
+        stacks: Counter mapping tuples of pstats function keys (root first) to a weight
+        path: output filename
+    """
+    with open(path, "w") as f:
+        for stack, weight in sorted(stacks.items()):
+            if weight > 0:
+                f.write(";".join(_label(func) for func in stack) + f" {weight}\n")
+
+
+def _dump_pstats(stats: dict, path: str):
+    """
+    Writes a raw pstats dictionary so it can be loaded with pstats.Stats(path).
+
+    Args:
+        stats: {func: (cc, nc, tt, ct, callers)} as produced by cProfile
+        path: output filename
+    """
+    result = pstats.Stats()
+    result.stats = stats
+    result.get_top_level_stats()
+    result.dump_stats(path)
+
+
+def _collapse_pstats(stats: dict) -> Counter:
+    """
+    Rebuilds call stacks from a cProfile call graph.
+
+    cProfile only keeps caller -> callee edges, so the time of a function that is
+    reached from several callers is split between them in proportion to the
+    cumulative time of each edge. Recursive calls are folded into the frame
+    that is already on the stack.
+
+    Args:
+        stats: {func: (cc, nc, tt, ct, callers)} as produced by cProfile
+
+    Returns:
+        Counter mapping stacks to their own time in microseconds
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    stacks = Counter()
+
+    def walk(func, path, fraction):
+        path = path + (func,)
+        stacks[path] += round(stats[func][2] * fraction * 1e6)
+        for callee, edge in callees[func].items():
+            callee_ct = stats[callee][3]
+            if callee in path or callee_ct <= 0:
+                continue
+            walk(callee, path, fraction * min(1.0, edge[3] / callee_ct))
+
+    # Roots are the functions called directly by the profiled code
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (), 1.0)
+    return stacks
+
+
+def _stats_from_samples(samples: Counter, interval: float) -> dict:
+    """
+    Converts sampled stacks into a pstats dictionary.
+
+    Sample counts stand in for call counts and every sample is worth
+    interval seconds, so times are estimates.
+
+    Args:
+        samples: Counter mapping stacks (root first) to number of samples
+        interval: seconds per sample
+
+    Returns:
+        {func: (cc, nc, tt, ct, callers)} in the same layout as cProfile
+    """
+    totals = defaultdict(lambda: [0, 0, 0.0, 0.0])
+    callers = defaultdict(lambda: defaultdict(lambda: [0, 0, 0.0, 0.0]))
+
+    for stack, count in samples.items():
+        elapsed = count * interval
+        leaf = stack[-1]
+        totals[leaf][0] += count
+        totals[leaf][1] += count
+        totals[leaf][2] += elapsed
+
+        # Count a function once per stack even if it recursed
+        for func in set(stack):
+            totals[func][3] += elapsed
+        for caller, callee in set(zip(stack, stack[1:])):
+            edge = callers[callee][caller]
+            edge[0] += count
+            edge[1] += count
+            edge[3] += elapsed
+            if callee == leaf:
+                edge[2] += elapsed
+
+    return {
+        func: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers[func].items()})
+        for func, (cc, nc, tt, ct) in totals.items()
+    }
+
+
+def _run_sampled(func, n: int, interval: float, samples: Counter):
+    """
+    Calls func(n) while a SIGPROF timer records the Python stack.
+    Sampling stops at this frame, so only the measured call is seen.
+    """
+    def on_sample(signum, frame):
+        stack = []
+        while frame is not None and frame.f_code is not _run_sampled.__code__:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        if stack:
+            samples[tuple(reversed(stack))] += 1
+
+    previous = signal.signal(signal.SIGPROF, on_sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        return func(n)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+
+def profile_call(func, n: int, mode: str, out_prefix: str, interval: float = SAMPLE_INTERVAL):
+    """
+    Runs func(n) under the requested profiler and writes the results.
+    The call is timed on its own, so the reported time includes the profiler
+    overhead but not turning the profile into the output files.
+
+    Args:
+        func: function to profile
+        n (int): argument passed to func
+        mode (str): "cprofile" (deterministic) or "sample" (statistical)
+        out_prefix (str): output path without extension; writes
+                          <out_prefix>.pstats and <out_prefix>.collapsed
+        interval (float): seconds of CPU time between samples (sample mode only)
+
+    Returns:
+        tuple: (whatever func(n) returns, seconds spent in the profiled call)
+
+    Raises:
+        ValueError: if the mode is unknown or sampling is unsupported on this platform
+    """
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        result = profiler.runcall(func, n)
+        elapsed = time.perf_counter() - start
+        profiler.create_stats()
+        stats = profiler.stats
+        stacks = _collapse_pstats(stats)
+    elif mode == "sample":
+        if not hasattr(signal, "setitimer"):
+            raise ValueError("Sampling profiler needs signal.setitimer (not available on Windows)")
+        samples = Counter()
+        start = time.perf_counter()
+        result = _run_sampled(func, n, interval, samples)
+        elapsed = time.perf_counter() - start
+        stats = _stats_from_samples(samples, interval)
+        stacks = samples
+    else:
+        raise ValueError(f"Unknown profile mode {mode}, expected one of {PROFILE_MODES}")
+
+    _dump_pstats(stats, out_prefix + ".pstats")
+    _write_collapsed(stacks, out_prefix + ".collapsed")
+    return result, elapsed
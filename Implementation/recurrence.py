@@ -0,0 +1,136 @@
+"""
+Linear Recurrence Engine
+Name: Siddharth Kakked
+Date: 19th October 2026
+Generalizes the fibonacci algorithms to any k-th order linear recurrence
+
+    a(n) = c1 * a(n-1) + c2 * a(n-2) + ... + ck * a(n-k)
+
+given the coefficients c1..ck and the initial terms a(0)..a(k-1).
+    1. term(n)   - single term in O(k^2 log n) using Kitamasa's method
+    2. series()  - streaming generator of the terms in O(k) per term
+Both accept an optional modulus. Fibonacci, Lucas, Pell and Tribonacci are
+provided as ready-made instances.
+"""
+from collections import deque
+from typing import Iterator, List, Optional
+
+# Global variable to track number of operations (multiply-adds)
+OPS = 0
+
+
+class LinearRecurrence:
+    """A k-th order linear recurrence with constant coefficients"""
+
+    def __init__(self, coefficients: List[int], initial: List[int]):
+        """
+        Args:
+            coefficients: [c1, ..., ck], c1 multiplies the previous term
+            initial: [a(0), ..., a(k-1)]
+
+        Raises:
+            ValueError: if the lists are empty or have different lengths
+        """
+        if not coefficients or len(coefficients) != len(initial):
+            raise ValueError("Need k >= 1 coefficients and exactly k initial terms")
+        self.coefficients = list(coefficients)
+        self.initial = list(initial)
+        self.k = len(coefficients)
+
+    def _reduce(self, poly: list, mod: Optional[int]) -> list:
+        """
+        Reduces a polynomial modulo the characteristic polynomial
+        x^k - c1 x^(k-1) - ... - ck, using x^k = c1 x^(k-1) + ... + ck.
+
+        Args:
+            poly: coefficients, index i holds the coefficient of x^i
+            mod: optional modulus applied to every coefficient
+
+        Returns:
+            list of the k low coefficients
+        """
+        global OPS
+        k = self.k
+        for i in range(len(poly) - 1, k - 1, -1):
+            top = poly[i]
+            if top:
+                OPS += k
+                for j, c in enumerate(self.coefficients, start=1):
+                    poly[i - j] += top * c
+        poly = poly[:k]
+        if mod is not None:
+            poly = [p % mod for p in poly]
+        return poly
+
+    def _multiply(self, a: list, b: list, mod: Optional[int]) -> list:
+        """
+        Multiplies two reduced polynomials and reduces the product. O(k^2)
+        """
+        global OPS
+        product = [0] * (2 * self.k - 1)
+        OPS += self.k * self.k
+        for i, x in enumerate(a):
+            if x:
+                for j, y in enumerate(b):
+                    product[i + j] += x * y
+        return self._reduce(product, mod)
+
+    def term(self, n: int, mod: Optional[int] = None) -> int:
+        """
+        Computes a(n) with Kitamasa's method: x^n is reduced modulo the
+        characteristic polynomial, and a(n) is the same combination of the
+        initial terms. Square-and-multiply makes it O(k^2 log n).
+
+        Args:
+            n: index of the term (0-indexed)
+            mod: optional modulus
+
+        Returns:
+            a(n), or a(n) % mod
+        """
+        if n < 0:
+            raise ValueError(f"n must be non-negative, got {n}")
+        if n < self.k:
+            return self.initial[n] if mod is None else self.initial[n] % mod
+
+        # Start from x^0 and walk the bits of n from the most significant one
+        poly = [1] + [0] * (self.k - 1)
+        for bit in bin(n)[2:]:
+            poly = self._multiply(poly, poly, mod)
+            if bit == "1":
+                poly = self._reduce([0] + poly, mod)  # multiply by x
+
+        result = sum(d * a for d, a in zip(poly, self.initial))
+        return result if mod is None else result % mod
+
+    def series(self, n: Optional[int] = None, mod: Optional[int] = None) -> Iterator[int]:
+        """
+        Streams a(0), a(1), ... keeping only the last k terms.
+
+        Args:
+            n: number of terms to generate, None for an endless stream
+            mod: optional modulus
+
+        Yields:
+            the next term of the recurrence
+        """
+        global OPS
+        window = deque(self.initial if mod is None else [a % mod for a in self.initial])
+        produced = 0
+        while n is None or produced < n:
+            value = window[0]
+            yield value
+            produced += 1
+
+            # Next term from the window; window[-1] is the most recent term
+            OPS += 1
+            nxt = sum(c * a for c, a in zip(self.coefficients, reversed(window)))
+            window.popleft()
+            window.append(nxt if mod is None else nxt % mod)
+
+
+# Well known recurrences
+FIBONACCI = LinearRecurrence([1, 1], [0, 1])        # 0, 1, 1, 2, 3, 5, 8, ...
+LUCAS = LinearRecurrence([1, 1], [2, 1])            # 2, 1, 3, 4, 7, 11, 18, ...
+PELL = LinearRecurrence([2, 1], [0, 1])             # 0, 1, 2, 5, 12, 29, 70, ...
+TRIBONACCI = LinearRecurrence([1, 1, 1], [0, 0, 1]) # 0, 0, 1, 1, 2, 4, 7, 13, ...
@@ -1,5 +1,13 @@
 
-from fibonacci import fibonacci_iterative, fibonacci_dp, fibonacci_r
+from concurrent.futures import ProcessPoolExecutor
+
+import fibonacci
+from fibonacci import fibonacci_iterative, fibonacci_dp, fibonacci_r, fibonacci_r_parallel
+from fibonacci import CacheMode, dp_cache_footprint, fibonacci_dp_full, run_and_time
+from recurrence import FIBONACCI, LUCAS, PELL, TRIBONACCI, LinearRecurrence
+from verify import random_primes, verify_fibonacci
+from fibonacci_index import FibonacciIndex
+import random
 
 def test_fibonacci():
     """Test all three Fibonacci implementations"""
@@ -37,5 +45,95 @@ def test_fibonacci():
             else:
                 print("  ✗ MISMATCH!\n")
 
+def test_fibonacci_r_parallel():
+    """Parallel recursion must match fibonacci_r in value and operation count"""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for n in [0, 1, 2, 5, 10, 20]:
+            fibonacci.OPS = 0
+            expected = fibonacci_r(n)
+            expected_ops = fibonacci.OPS
+
+            fibonacci.OPS = 0
+            assert fibonacci_r_parallel(n, executor) == expected
+            assert fibonacci.OPS == expected_ops
+
+def test_recurrence_engine():
+    """Kitamasa term queries must agree with streaming and the iterative algorithm"""
+    for n in [0, 1, 2, 5, 10, 100, 1000]:
+        assert FIBONACCI.term(n) == fibonacci_iterative(n)
+
+    for rec in [LUCAS, PELL, TRIBONACCI, LinearRecurrence([2, -1, 3, 5], [1, 0, 4, 2])]:
+        streamed = list(rec.series(60))
+        assert [rec.term(i) for i in range(60)] == streamed
+        assert [rec.term(i, mod=97) for i in range(60)] == list(rec.series(60, mod=97))
+
+    assert list(LUCAS.series(6)) == [2, 1, 3, 4, 7, 11]
+    assert FIBONACCI.term(10**18, mod=10**9 + 7) == 209783453
+
+def test_verify_fibonacci():
+    """Identity checks accept correct huge values and reject corrupted ones"""
+    primes = random_primes(3, random.Random(5008))
+    n = 20000
+    fn, fn1, f2n = FIBONACCI.term(n), FIBONACCI.term(n + 1), FIBONACCI.term(2 * n)
+
+    assert verify_fibonacci(n, fn, fn1, f2n, primes) == []
+    assert verify_fibonacci(n, fn + 1, fn1, f2n, primes)
+    assert verify_fibonacci(n, fn, fn1 - 1, f2n, primes)
+    assert verify_fibonacci(n, fn, fn1, f2n + 2, primes)
+
+def test_fibonacci_index():
+    """Inverse lookup and Zeckendorf inside and beyond the precomputed table"""
+    index = FibonacciIndex(50)
+    series = list(FIBONACCI.series(400))
+
+    assert index.index_of_many([0, 1, 5, 6]) == [0, 1, 5, None]
+    for k in range(3, 400):
+        assert index.index_of(series[k]) == k
+        assert not index.is_fibonacci(series[k] + 1) or k <= 3
+
+    rng = random.Random(5008)
+    for x in [rng.getrandbits(bits) for bits in range(1, 250)]:
+        indices = index.zeckendorf(x)
+        assert sum(series[k] for k in indices) == x
+        assert all(a - b >= 2 for a, b in zip(indices, indices[1:]))
+
+    # F(k) - 1 = F(k-1) + F(k-3) + ..., walking down through the table boundary
+    for k in (61, 398, 399):
+        assert index.zeckendorf(series[k] - 1) == list(range(k - 1, 1, -2))
+        assert index.largest_at_most(series[k] - 1) == (k - 1, series[k - 1])
+
+def test_dp_cache_modes():
+    """DP op counts follow the requested cache state"""
+    n = 30
+    _, cold_ops = run_and_time(fibonacci_dp_full, n, cache_mode=CacheMode.COLD)
+    assert cold_ops == n - 1
+    assert dp_cache_footprint()[0] == n + 1  # F(0)..F(n) cached
+
+    # Running again cold gives the same count, the cache was cleared first
+    assert run_and_time(fibonacci_dp_full, n)[1] == cold_ops
+    assert run_and_time(fibonacci_dp_full, n, cache_mode=CacheMode.WARM)[1] == 0
+    # Only the timed run counts: one hit per number, the warm-up misses are excluded
+    assert dp_cache_footprint() == (n + 1, n, 0)
+
+    assert run_and_time(fibonacci_dp_full, n, cache_mode=CacheMode.PER_CALL)[1] == sum(i - 1 for i in range(1, n + 1))
+    # Peak entries and counts summed over every number, not just the last one
+    entries, _, misses = dp_cache_footprint()
+    assert entries == n + 1
+    assert misses == sum(i + 1 for i in range(2, n + 1)) + 1
+
+    # The mode ends with the timed run, a plain call reuses the cache again
+    fibonacci_dp.cache_clear()
+    fibonacci.OPS = 0
+    fibonacci_dp_full(n)
+    assert fibonacci.OPS == n - 1
+
+    # WARM fills the cache bottom-up, far beyond the C stack's recursion depth
+    assert run_and_time(fibonacci_dp_full, 20000, cache_mode=CacheMode.WARM)[1] == 0
+
 if __name__ == "__main__":
-    test_fibonacci()
\ No newline at end of file
+    test_fibonacci()
+    test_fibonacci_r_parallel()
+    test_recurrence_engine()
+    test_verify_fibonacci()
+    test_fibonacci_index()
+    test_dp_cache_modes()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Tests for the benchmarking tools around the fibonacci implementations
+(test_runner.py, profiling.py, benchmark_suite.py).
+"""
+import os
+import pstats
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import benchmark_suite
+from benchmark_suite import allowed_time, compare
+from profiling import profile_call
+import test_runner
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_flag_noisy():
+    """Only samples preempted far more often than the sweep median are noisy"""
+    # user, sys, maxrss, nvcsw, nivcsw, minflt, majflt
+    rows = [
+        ["0.050000", "0.010000", 17000, 1, 20, 2900, 0],
+        ["0.050000", "0.010000", 17000, 1, 24, 2900, 0],
+        ["0.060000", "0.000000", 17000, 1, 18, 2900, 0],
+        ["0.050000", "0.010000", 17000, 1, 400, 2900, 0],  # preempted a lot
+        ["0.050000", "0.010000", 17000, 1, 20, 2900, 3],   # hit the disk
+        [],                                                # no usage available
+    ]
+    assert [row[-1] if row else None for row in test_runner.flag_noisy(rows)] == [0, 0, 0, 1, 1, None]
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4")
+def test_run_single_rusage(monkeypatch):
+    """run_single reports the usage of its own child, not a running maximum"""
+    monkeypatch.setattr(test_runner, "EXEC", f"{sys.executable} {os.path.join(HERE, 'fibonacci.py')}")
+    result = test_runner.run_single(10, 4)
+
+    assert result["operations"] == ["8", "9", "-"]
+    user, system, maxrss = result["rusage"][:3]
+    assert float(user) + float(system) > 0
+    assert maxrss > 0
+    assert len(result["rusage"]) == len(test_runner.RUSAGE_HEADER.split(",")) - 2  # no N, no flag yet
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4")
+def test_run_child_timeout(monkeypatch):
+    """A child killed at the timeout is reaped by wait4 and reported as a timeout"""
+    monkeypatch.setattr(test_runner, "TIMEOUT", 0.2)
+    with pytest.raises(subprocess.TimeoutExpired):
+        test_runner.run_child([sys.executable, "-c", "import time; time.sleep(10)"])
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4") or not os.path.isdir("/proc"), reason="needs os.wait4 and /proc")
+def test_run_child_timeout_kills_workers(monkeypatch, tmp_path):
+    """Processes started by a timed out child are killed with it"""
+    monkeypatch.setattr(test_runner, "TIMEOUT", 0.5)
+    pid_file = tmp_path / "worker.pid"
+    script = ("import subprocess, sys, time\n"
+              "worker = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+              f"open({str(pid_file)!r}, 'w').write(str(worker.pid))\n"
+              "time.sleep(30)\n")
+    with pytest.raises(subprocess.TimeoutExpired):
+        test_runner.run_child([sys.executable, "-c", script])
+
+    worker = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            with open(f"/proc/{worker}/stat") as f:
+                if f.read().split(")")[-1].split()[0] in "ZX":
+                    break  # Killed, waiting to be reaped by init
+        except FileNotFoundError:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("worker process survived the timeout")
+
+
+def _spin(n: int) -> int:
+    """Small CPU bound function to profile"""
+    total = 0
+    for i in range(n):
+        total += _square(i)
+    return total
+
+
+def _square(i: int) -> int:
+    return i * i
+
+
+def _read_profile(prefix: str) -> tuple:
+    """Loads the .pstats and .collapsed files written by profile_call"""
+    stats = pstats.Stats(prefix + ".pstats").stats
+    names = {func[2] for func in stats}
+    with open(prefix + ".collapsed") as f:
+        lines = [line.rsplit(" ", 1) for line in f.read().splitlines()]
+    return names, lines
+
+
+def test_profile_call_cprofile(tmp_path):
+    """Deterministic profile reloads with the measured call at the root"""
+    prefix = str(tmp_path / "spin")
+    result, elapsed = profile_call(_spin, 2000, "cprofile", prefix)
+    assert result == _spin(2000)
+    assert elapsed > 0
+
+    names, lines = _read_profile(prefix)
+    assert {"_spin", "_square"} <= names
+    stacks = {stack: int(weight) for stack, weight in lines}
+    assert all(weight > 0 for weight in stacks.values())
+    assert any(stack.startswith("_spin (") and ";_square (" in stack for stack in stacks)
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs signal.setitimer")
+def test_profile_call_sample(tmp_path):
+    """Sampled stacks stop at the measured call and convert to pstats"""
+    prefix = str(tmp_path / "spin")
+    result, elapsed = profile_call(_spin, 300000, "sample", prefix)
+    assert result == _spin(300000)
+    assert elapsed > 0
+
+    names, lines = _read_profile(prefix)
+    assert "_spin" in names
+    assert lines
+    for stack, count in lines:
+        assert stack.startswith("_spin (")  # nothing from the test or pytest above it
+        assert int(count) > 0
+
+
+def test_allowed_time():
+    """The largest of the relative, absolute and spread tolerances applies"""
+    rel = benchmark_suite.REL_TOL
+    # Tight samples: the relative tolerance wins
+    assert allowed_time(1.0, [1.0, 1.0, 1.0]) == pytest.approx(1.0 + rel)
+    # Tiny times: the absolute tolerance wins
+    assert allowed_time(1e-6, [1e-6, 1e-6]) == pytest.approx(1e-6 + benchmark_suite.ABS_TOL)
+    # Widely spread samples: the robust spread wins
+    samples = [1.0, 2.0, 3.0, 4.0, 5.0]  # median 3, MAD 1
+    assert allowed_time(1.0, samples) == pytest.approx(1.0 + benchmark_suite.MAD_Z * 1.4826)
+
+
+def test_compare():
+    """Timings are scaled by the machine factor, op counts must match exactly"""
+    # 0.010s on the baseline machine, this machine is twice as slow
+    status, line = compare("Iterative", 501, "0.010000", "499", [0.021, 0.022, 0.020], {"499"}, 2.0)
+    assert status == "ok"
+    assert line.endswith(",ok")
+
+    status, _ = compare("Iterative", 501, "0.010000", "499", [0.021, 0.022, 0.020], {"499"}, 1.0)
+    assert status == "REGRESSION"
+
+    # Operation counts are checked before any timing
+    status, line = compare("Iterative", 501, "0.010000", "499", [0.001], {"500"}, 2.0)
+    assert status == "OPS DRIFT"
+    assert "ops 499" in line and "ops 500" in line
+    status, _ = compare("Iterative", 501, "0.010000", "499", [0.001], {"499", "500"}, 2.0)
+    assert status == "OPS DRIFT"
+
+
+def test_baseline_op_cost(monkeypatch):
+    """The calibration reference comes from the committed python baselines"""
+    monkeypatch.chdir(HERE)
+    reference = benchmark_suite.baseline_op_cost(4999)
+    assert set(reference) == {"Iterative", "Dynamic Programming"}  # no recursive rows near 4999
+    assert 0 < reference["Iterative"] < reference["Dynamic Programming"] < 1e-5
+    assert set(benchmark_suite.baseline_op_cost(21)) == set(benchmark_suite.ALGORITHMS)
@@ -10,6 +10,10 @@ import sys
 import csv
 import argparse
 import os
+import signal
+import statistics
+import tempfile
+import threading
 
 # Detect platform and set appropriate executable name
 if os.name == 'nt':  # Windows
@@ -21,7 +25,21 @@ TIMEOUT = 60                          # Timeout in seconds (prevents infinite lo
 OUT_DEFAULT = "fibonacci_run.csv"     # Default output filename
 OUT_FILE_TIME = "timings_"            # Prefix for timing results file
 OUT_FILE_OPS = "ops_"                 # Prefix for operations results file
+OUT_FILE_RUSAGE = "rusage_"           # Prefix for resource usage results file
+OUT_FILE_CACHE = "cache_"             # Prefix for DP cache footprint results file
 CSV_HEADER = "N,Iterative,Dynamic Programming,Recursive"  # Column headers
+PARALLEL_HEADER = CSV_HEADER + ",Recursive Parallel"      # Column headers with --parallel
+RUSAGE_HEADER = "N,User CPU,System CPU,Max RSS,Voluntary CS,Involuntary CS,Minor Faults,Major Faults,Noisy"
+CACHE_HEADER = "N,Cache Mode,Entries,Hits,Misses"
+NOISE_FACTOR = 3.0                    # Preemption rate above this multiple of the sweep median marks a sample as noisy
+MIN_IVCSW_RATE = 1.0                  # Floor for the median rate (switches per CPU second)
+CPU_AFFINITY = None                   # Set of CPU ids to pin the benchmark to (None = no pinning)
+PARALLEL = False                      # Also benchmark the parallel recursive algorithm
+WORKERS = None                        # Worker processes for the parallel recursion (None = program default)
+CACHE_MODE = None                     # DP cache state passed to the program ("cold", "warm" or "per-call")
+PROFILE = None                        # Profiling mode passed to the program ("cprofile" or "sample")
+PROFILE_N = []                        # n values to collect profiles for
+PROFILE_DIR = "."                     # Directory the program writes profiles to
 
 class RecursionTimeoutError(Exception):
     """
@@ -29,7 +47,124 @@ class RecursionTimeoutError(Exception):
     """
     pass
 
-def run_single(n: int, typ: int) -> dict:
+# Run type to fall back to when a run times out, with a description for the log
+FALLBACK = {
+    3: (4, "iterative and DP only"),
+    6: (7, "iterative, DP and parallel recursive"),
+    7: (4, "iterative and DP only"),
+}
+
+def rusage_row(usage) -> list:
+    """
+    Formats the resource usage of one finished child.
+
+    Args:
+        usage: struct_rusage of that child, as returned by os.wait4
+
+    Returns:
+        list: [user cpu, system cpu, max rss, voluntary cs, involuntary cs,
+               minor faults, major faults]; max rss is in kilobytes on Linux
+               and bytes on macOS
+    """
+    return [f"{usage.ru_utime:0.6f}", f"{usage.ru_stime:0.6f}", usage.ru_maxrss,
+            usage.ru_nvcsw, usage.ru_nivcsw, usage.ru_minflt, usage.ru_majflt]
+
+def flag_noisy(rows: list) -> list:
+    """
+    Appends a noisy flag (0/1) to every resource usage row of a sweep.
+
+    Interpreter startup alone causes some preemption, so a fixed count
+    would flag every Python sample. Instead the involuntary context switches
+    per CPU second are compared with the median of the sweep: a sample is
+    noisy if its rate is above NOISE_FACTOR times the median, or if it had
+    to wait for the disk (major page faults).
+
+    Args:
+        rows (list): rows from rusage_row, empty rows are left alone
+
+    Returns:
+        list: the rows with the flag appended
+    """
+    def rate(row):
+        cpu = float(row[0]) + float(row[1])
+        return row[4] / max(cpu, 0.001)
+
+    measured = [row for row in rows if row]
+    if not measured:
+        return rows
+    limit = NOISE_FACTOR * max(statistics.median(rate(row) for row in measured), MIN_IVCSW_RATE)
+
+    return [row + [int(rate(row) > limit or row[6] > 0)] if row else row for row in rows]
+
+def run_child(args: list) -> tuple:
+    """
+    Runs one child process and collects its own resource usage.
+
+    The child is reaped with os.wait4, so the usage (including max RSS)
+    belongs to this run only. Output goes through temporary files so a
+    chatty child can never block on a full pipe. The child gets its own
+    process group, and a timeout kills the whole group, so worker
+    processes it started cannot outlive it.
+
+    Args:
+        args (list): command line to run
+
+    Returns:
+        tuple: (return code, stdout, stderr, struct_rusage)
+
+    Raises:
+        subprocess.TimeoutExpired: If the child runs longer than TIMEOUT seconds
+    """
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as err:
+        process = subprocess.Popen(args, stdout=out, stderr=err, text=True, start_new_session=True)
+        timed_out = threading.Event()
+
+        def kill_group():
+            # Not process.kill(): its poll() could reap the child before wait4 does
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass  # Exited right at the timeout
+
+        def kill():
+            timed_out.set()
+            kill_group()
+
+        # Kill the child if it runs too long, wait4 then returns right away
+        timer = threading.Timer(TIMEOUT, kill)
+        timer.start()
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except BaseException:
+            # Interrupted (e.g. Ctrl-C), the child no longer gets the terminal's signals
+            kill_group()
+            raise
+        finally:
+            timer.cancel()
+        process.returncode = os.waitstatus_to_exitcode(status)  # Already reaped
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(args, TIMEOUT)
+
+        out.seek(0)
+        err.seek(0)
+        return process.returncode, out.read(), err.read(), usage
+
+def pin_cpus(cpus):
+    """
+    Pins the runner (and so every child it spawns) to the given CPUs.
+
+    Args:
+        cpus: iterable of CPU ids, or None to leave the affinity alone
+    """
+    if cpus is None:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        print("CPU affinity is not supported on this platform, running unpinned", file=sys.stderr)
+        return
+    os.sched_setaffinity(0, set(cpus))
+
+def run_single(n: int, typ: int, profile: bool = False) -> dict:
     """
     Executes a single test run of the fibonacci program.
     
@@ -41,11 +176,19 @@ def run_single(n: int, typ: int) -> dict:
                    2 = dynamic programming
                    3 = all three algorithms
                    4 = iterative and DP only
+                   6 = all three plus parallel recursive
+                   7 = iterative, DP and parallel recursive
+        profile (bool): pass the PROFILE flags to the program (Python only);
+                        the timings of such a run include profiler overhead
 
     Returns:
-        dict: Dictionary with two keys:
+        dict: Dictionary with three keys:
               - 'timings': list of execution times [iterative, dp, recursive]
               - 'operations': list of operation counts [iterative, dp, recursive]
+              - 'rusage': resource usage of this child (see rusage_row),
+                          empty where os.wait4 is unavailable (Windows)
+              - 'cache': [mode, entries, hits, misses] of the DP cache,
+                         empty unless CACHE_MODE is set
 
     Raises:
         RecursionTimeoutError: If execution exceeds TIMEOUT seconds
@@ -54,24 +197,45 @@ def run_single(n: int, typ: int) -> dict:
     try:
         # Build command string and execute
         command = f"{EXEC} {n} {typ}"
-        results = subprocess.run(
-            command.split(),           # Split command into list for subprocess
-            timeout=TIMEOUT,           # Kill process if it runs too long
-            capture_output=True,       # Capture stdout and stderr
-            text=True                  # Return output as strings, not bytes
-        )
+        if profile:
+            # Only the Python programs understand the profiling flags
+            command += f" --profile {PROFILE} --profile-dir {PROFILE_DIR}"
+        if PARALLEL and WORKERS:
+            command += f" --workers {WORKERS}"
+        if CACHE_MODE:
+            # Only the Python programs understand the cache flags
+            command += f" --cache {CACHE_MODE} --cache-report"
+        if hasattr(os, "wait4"):
+            # Reap the child ourselves to get its own resource usage
+            returncode, stdout, stderr, usage = run_child(command.split())
+            rusage = rusage_row(usage)
+        else:
+            results = subprocess.run(
+                command.split(),           # Split command into list for subprocess
+                timeout=TIMEOUT,           # Kill process if it runs too long
+                capture_output=True,       # Capture stdout and stderr
+                text=True                  # Return output as strings, not bytes
+            )
+            returncode, stdout, stderr = results.returncode, results.stdout, results.stderr
+            rusage = []
     except subprocess.TimeoutExpired:
         # Timeout usually means recursive algorithm is taking too long
         raise RecursionTimeoutError(f"Timeout of {TIMEOUT} seconds reached for n={n}")
 
     # Check if program executed successfully
-    if results.returncode != 0:
-        raise Exception(f"Error running n={n}: {results.stderr}")
+    if returncode != 0:
+        raise Exception(f"Error running n={n}: {stderr}")
 
     # Parse comma-separated output
     # Expected format: time1,ops1,time2,ops2,time3,ops3
     # Or for type 4: time1,ops1,time2,ops2,-,-
-    results_line = results.stdout.strip().split(",")
+    # Types 6 and 7 add a fourth pair for the parallel recursive algorithm
+    # With --cache-report a second line follows: cache,mode,entries,hits,misses
+    lines = stdout.strip().splitlines()
+    results_line = lines[0].split(",")
+    cache = []
+    if len(lines) > 1 and lines[1].startswith("cache,"):
+        cache = lines[1].split(",")[1:]
     
     timings = []      # Store execution times
     operations = []   # Store operation counts
@@ -81,28 +245,31 @@ def run_single(n: int, typ: int) -> dict:
         timings.append(results_line[i])
         operations.append(results_line[i + 1])
 
-    return {"timings": timings, "operations": operations}
+    return {"timings": timings, "operations": operations, "rusage": rusage, "cache": cache}
 
-def save_to_csv(values: list, out_file: str, step: int):
+def save_to_csv(values: list, out_file: str, step: int, header: str = CSV_HEADER):
     """
     Saves collected data to a CSV file with proper headers.
+    Rows shorter than the header are padded with "-" (skipped algorithm).
     
     Args:
         values (list): List of result rows to write
         out_file (str): Output filename to write to
         step (int): Step size used in testing (for calculating N values)
+        header (str): Comma separated column headers
     """
     with open(out_file, "w", newline="") as f:
         csv_writer = csv.writer(f)
         
         # Write header row
-        csv_writer.writerow(CSV_HEADER.split(","))
+        csv_writer.writerow(header.split(","))
         
         # Write data rows with N values
         for i, row in enumerate(values):
             # Calculate actual N value: starts at 1, increments by step
             n_value = i * step + 1
             row_with_n = [n_value] + row
+            row_with_n += ["-"] * (len(header.split(",")) - len(row_with_n))
             csv_writer.writerow(row_with_n)
 
 def main(n: int, step: int = 1, out_file: str = OUT_DEFAULT):
@@ -115,38 +282,57 @@ def main(n: int, step: int = 1, out_file: str = OUT_DEFAULT):
         out_file (str): Base filename for output CSVs
     
     Output:
-        Creates two CSV files:
+        Creates three CSV files:
         - ops_<out_file>: Operation counts for each algorithm
         - timings_<out_file>: Execution times for each algorithm
+        - rusage_<out_file>: CPU time, memory, context switches and page
+          faults of each run, with a flag for noisy samples (Unix only)
+        - cache_<out_file>: DP cache footprint of each run (only with --cache)
     """
-    # Start by testing all three algorithms (type 3)
-    run_type = 3
+    # Pin to the requested CPUs before spawning any children
+    pin_cpus(CPU_AFFINITY)
+
+    # Start by testing all three algorithms (type 3), plus parallel recursive if requested (type 6)
+    run_type = 6 if PARALLEL else 3
+    header = PARALLEL_HEADER if PARALLEL else CSV_HEADER
     
     # Storage for results
     results = {
         "timings": [],      # List of timing rows
-        "operations": []    # List of operation count rows
+        "operations": [],   # List of operation count rows
+        "rusage": [],       # List of resource usage rows
+        "cache": []         # List of DP cache footprint rows
     }
     
     # Run tests with increasing n values
     for i in range(1, n + 1, step):
         try:
-            # Execute single test
-            result = run_single(i, run_type)
-            
+            # Execute single test, falling back until a run type finishes in time
+            result = None
+            while result is None:
+                try:
+                    result = run_single(i, run_type)
+                except RecursionTimeoutError:
+                    if run_type not in FALLBACK:
+                        raise  # Nothing left to drop
+                    # A recursive algorithm timed out - drop the slowest remaining one
+                    run_type, description = FALLBACK[run_type]
+                    print(f"Timeout at n={i}, switching to {description}", file=sys.stderr)
+
+            # Profiles come from an extra run with the type that just finished,
+            # so the measured run stays unprofiled
+            if PROFILE and i in PROFILE_N:
+                try:
+                    run_single(i, run_type, profile=True)
+                except RecursionTimeoutError:
+                    # Profiler overhead pushed it past the timeout, the measurement still counts
+                    print(f"Timeout while profiling n={i}, no profile written", file=sys.stderr)
+
             # Store results
             results["timings"].append(result["timings"])
             results["operations"].append(result["operations"])
-            
-        except RecursionTimeoutError as e:
-            # Recursive algorithm timed out - switch to iterative+DP only
-            print(f"Timeout at n={i}, switching to iterative and DP only", file=sys.stderr)
-            run_type = 4  # Type 4 = iterative and DP only, skip recursive
-            
-            # Retry current n with new run type
-            result = run_single(i, run_type)
-            results["timings"].append(result["timings"])
-            results["operations"].append(result["operations"])
+            results["rusage"].append(result["rusage"])
+            results["cache"].append(result["cache"])
             
         except Exception as e:
             # Other error occurred - print and stop testing
@@ -154,8 +340,18 @@ def main(n: int, step: int = 1, out_file: str = OUT_DEFAULT):
             break
     
     # Save results to CSV files
-    save_to_csv(results["operations"], OUT_FILE_OPS + out_file, step)
-    save_to_csv(results["timings"], OUT_FILE_TIME + out_file, step)
+    save_to_csv(results["operations"], OUT_FILE_OPS + out_file, step, header)
+    save_to_csv(results["timings"], OUT_FILE_TIME + out_file, step, header)
+    if CACHE_MODE:
+        save_to_csv(results["cache"], OUT_FILE_CACHE + out_file, step, CACHE_HEADER)
+    if hasattr(os, "wait4"):
+        rusage = flag_noisy(results["rusage"])
+        save_to_csv(rusage, OUT_FILE_RUSAGE + out_file, step, RUSAGE_HEADER)
+
+        # Warn about samples that were disturbed by the scheduler or paging
+        noisy = sum(row[-1] for row in rusage if row)
+        if noisy:
+            print(f"{noisy} noisy sample(s) flagged in {OUT_FILE_RUSAGE + out_file}", file=sys.stderr)
     
     # Inform user where results were saved
     print(f"Results saved to {OUT_FILE_OPS + out_file} and {OUT_FILE_TIME + out_file}")
@@ -198,6 +394,57 @@ if __name__ == "__main__":
         default=EXEC, 
         help=f"Executable to run (default: {EXEC}). Use 'python3 fibonacci.py' for Python version"
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        default=False,
+        help="Also run the parallel recursive algorithm (Python program only) as an extra column"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Worker processes for the parallel recursive algorithm (default: CPU count)"
+    )
+    parser.add_argument(
+        "--cache",
+        choices=["cold", "warm", "per-call"],
+        default=None,
+        help="DP cache state to measure in (Python programs only): cold = cleared before the run, "
+             "warm = pre-filled, per-call = cleared before every number. Also writes cache_<out>"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sample"],
+        default=None,
+        help="Collect profiles (Python programs only): cprofile = deterministic, sample = sampling"
+    )
+    parser.add_argument(
+        "--profile-n",
+        type=int,
+        nargs="+",
+        default=[],
+        help="The n values to profile when --profile is set"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=".",
+        help="Directory to write the .pstats and .collapsed profiles to (default: .)"
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        nargs="+",
+        default=None,
+        help="CPU id(s) to pin the benchmark runs to (default: no pinning)"
+    )
+    parser.add_argument(
+        "--noise-factor",
+        type=float,
+        default=NOISE_FACTOR,
+        help=f"Flag a sample noisy when its preemption rate is this many times the sweep median (default: {NOISE_FACTOR})"
+    )
     
     # Parse command line arguments
     args = parser.parse_args()
@@ -205,6 +452,14 @@ if __name__ == "__main__":
     # Update global configuration with command line arguments
     TIMEOUT = args.timeout
     EXEC = args.exec
+    CPU_AFFINITY = args.cpu
+    NOISE_FACTOR = args.noise_factor
+    PARALLEL = args.parallel
+    WORKERS = args.workers
+    CACHE_MODE = args.cache
+    PROFILE = args.profile
+    PROFILE_N = args.profile_n
+    PROFILE_DIR = args.profile_dir
     
     # Run the test suite
     main(args.n, args.step, args.out)
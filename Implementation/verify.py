@@ -0,0 +1,215 @@
+"""
+Verification Harness for Huge Fibonacci Results
+
+Name: Siddharth Kakked
+Date: 19th October 2026
+Checks F(n) for huge n without recomputing it. Every check works on the
+result reduced modulo a few random 61-bit primes, so each one costs a single
+pass over the digits plus O(log n) small multiplications:
+    1. Cassini's identity:  F(n-1) F(n+1) - F(n)^2 = (-1)^n
+    2. Doubling identity:   F(2n) = F(n) (2 F(n+1) - F(n))
+    3. Modular cross-check: F(n) mod p against fast doubling done mod p
+A wrong value passes a check for one random prime with probability about
+n / 2^61, so a handful of primes is plenty.
+
+Sample execution:
+    python3 verify.py 1000000 --primes 5
+"""
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from recurrence import FIBONACCI
+
+PRIME_BITS = 61          # Size of the random primes
+PRIMES_DEFAULT = 5       # Number of random primes per verification
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)  # Deterministic Miller-Rabin below 2^64
+
+
+def is_prime(m: int) -> bool:
+    """
+    Miller-Rabin primality test, deterministic for m < 2^64.
+
+    Args:
+        m: number to test
+
+    Returns:
+        True if m is prime
+    """
+    if m < 2:
+        return False
+    for p in MR_BASES:
+        if m % p == 0:
+            return m == p
+
+    d, s = m - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MR_BASES:
+        x = pow(a, d, m)
+        if x in (1, m - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % m
+            if x == m - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def random_primes(count: int, rng: random.Random, bits: int = PRIME_BITS) -> List[int]:
+    """
+    Picks distinct random primes of the given bit size.
+
+    Args:
+        count: number of primes
+        rng: random number generator (seed it for reproducible runs)
+        bits: bit size of each prime
+
+    Returns:
+        list of primes
+    """
+    primes = set()
+    while len(primes) < count:
+        # Top bit set for the full size, low bit set for odd
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_prime(candidate):
+            primes.add(candidate)
+    return sorted(primes)
+
+
+def fibonacci_pair_mod(n: int, p: int) -> tuple:
+    """
+    Computes (F(n) mod p, F(n+1) mod p) by fast doubling, independently of
+    the recurrence engine that produces the huge results.
+
+    Args:
+        n: index
+        p: modulus
+
+    Returns:
+        tuple: (F(n) % p, F(n+1) % p)
+    """
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        # F(2k) = F(k)(2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * (2 * b - a) % p
+        d = (a * a + b * b) % p
+        a, b = (d, (c + d) % p) if bit == "1" else (c, d)
+    return a, b
+
+
+def check_cassini(n: int, fn: int, fn1: int, p: int) -> bool:
+    """
+    Checks Cassini's identity F(n-1) F(n+1) - F(n)^2 = (-1)^n modulo p.
+
+    Args:
+        n: index of fn
+        fn: claimed F(n)
+        fn1: claimed F(n+1)
+        p: prime modulus
+
+    Returns:
+        True if the identity holds
+    """
+    a, b = fn % p, fn1 % p
+    previous = (b - a) % p  # F(n-1) = F(n+1) - F(n)
+    return (previous * b - a * a) % p == (-1) ** n % p
+
+
+def check_doubling(fn: int, fn1: int, f2n: int, p: int) -> bool:
+    """
+    Checks F(2n) = F(n) (2 F(n+1) - F(n)) modulo p.
+
+    Args:
+        fn: claimed F(n)
+        fn1: claimed F(n+1)
+        f2n: claimed F(2n)
+        p: prime modulus
+
+    Returns:
+        True if the identity holds
+    """
+    a, b = fn % p, fn1 % p
+    return a * (2 * b - a) % p == f2n % p
+
+
+def verify_fibonacci(n: int, fn: int, fn1: Optional[int] = None, f2n: Optional[int] = None,
+                     primes: Optional[List[int]] = None) -> List[str]:
+    """
+    Verifies claimed fibonacci values with every check that applies.
+
+    Args:
+        n: index of fn
+        fn: claimed F(n)
+        fn1: optional claimed F(n+1), enables Cassini and doubling checks
+        f2n: optional claimed F(2n), needs fn1
+        primes: moduli to use (default: PRIMES_DEFAULT random primes)
+
+    Returns:
+        list of failed checks, empty if everything passed
+    """
+    if primes is None:
+        primes = random_primes(PRIMES_DEFAULT, random.Random())
+
+    failures = []
+    for p in primes:
+        expected_fn, expected_fn1 = fibonacci_pair_mod(n, p)
+        if fn % p != expected_fn:
+            failures.append(f"F({n}) mod {p}")
+        if fn1 is not None:
+            if fn1 % p != expected_fn1:
+                failures.append(f"F({n + 1}) mod {p}")
+            if not check_cassini(n, fn, fn1, p):
+                failures.append(f"Cassini at n={n} mod {p}")
+            if f2n is not None and not check_doubling(fn, fn1, f2n, p):
+                failures.append(f"doubling F({2 * n}) mod {p}")
+    return failures
+
+
+def main(n: int, count: int, seed: Optional[int]):
+    """
+    Computes F(n), F(n+1) and F(2n) with the recurrence engine, verifies them
+    and reports how long the verification took compared to the computation.
+
+    Args:
+        n: index to verify
+        count: number of random primes
+        seed: random seed for the primes (None = random)
+
+    Returns:
+        int: exit code, 0 if verified, 1 otherwise
+    """
+    start = time.perf_counter()
+    fn, fn1, f2n = FIBONACCI.term(n), FIBONACCI.term(n + 1), FIBONACCI.term(2 * n)
+    compute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    primes = random_primes(count, random.Random(seed))
+    failures = verify_fibonacci(n, fn, fn1, f2n, primes)
+    verify_time = time.perf_counter() - start
+
+    print(f"n = {n}: F(n) has {fn.bit_length()} bits")
+    print(f"Compute: {compute_time:0.6f}s, Verify ({count} primes): {verify_time:0.6f}s")
+    if failures:
+        for failure in failures:
+            print(f"  FAILED: {failure}")
+        return 1
+    print("  All checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify huge fibonacci results with modular identities")
+    parser.add_argument("n", type=int, help="The index n to verify F(n), F(n+1) and F(2n) for")
+    parser.add_argument(
+        "--primes", type=int, default=PRIMES_DEFAULT,
+        help=f"Number of random {PRIME_BITS}-bit primes to check with (default: {PRIMES_DEFAULT})"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the primes")
+
+    args = parser.parse_args()
+    raise SystemExit(main(args.n, args.primes, args.seed))
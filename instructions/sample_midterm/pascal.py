@@ -7,6 +7,7 @@ from enum import Enum
 from functools import lru_cache
 import argparse
 from typing import Callable
+import os
 import sys
 import time
 
@@ -14,6 +15,11 @@ STACK_LIMIT = 1000
 sys.setrecursionlimit(100000)
 
 OPS = 0
+CACHE_MODE = None  # cache state pascal_dp is measured in, set by run_and_time
+CACHE_OFFSET = (0, 0, 0)  # cache_info -> timed run stats: (peak of cleared caches, hits, misses)
+# --profile uses the helpers that live with the fibonacci implementation
+PROFILING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Implementation")
+PROFILE_MODES = ("cprofile", "sample")  # same as Implementation/profiling.py
 
 
 class PascalType(Enum):
@@ -24,6 +30,12 @@ class PascalType(Enum):
     ITERATIVE = 0
 
 
+class CacheMode(Enum):
+    COLD = "cold"          # cleared once, reused across the row (default)
+    WARM = "warm"          # already holds the row when timing starts
+    PER_CALL = "per-call"  # cleared before every item in the row
+
+
 @lru_cache(maxsize=None)
 def pascal_dp(n: int, i: int) -> int:
     """
@@ -79,6 +91,13 @@ def recursive_pascal(n: int, func=pascal_r) -> list:
     #            for i in range(0, new_n + 1):
     #                func(new_n, i)
     n = n
+    # checked once, not per item - the enum comparison costs about as much as a dp step
+    if CACHE_MODE == CacheMode.PER_CALL and func is pascal_dp:
+        for i in range(0, n + 1):
+            clear_dp_cache()
+            result.append(func(n, i))
+        return result
+
     for i in range(0, n + 1):
         result.append(func(n, i))
     return result
@@ -135,7 +154,43 @@ def pascal_r_full(n: int) -> list:
     return recursive_pascal(n, func=pascal_r)
 
 
-def run_and_time(func: Callable, n: int, print_it: bool = False):
+def dp_cache_footprint() -> tuple:
+    """
+    Returns:
+        (entries, hits, misses) of the pascal_dp cache for the last timed run,
+        peak entries, no warm-up counts, summed over every item in per-call mode
+    """
+    info = pascal_dp.cache_info()
+    peak, hits, misses = CACHE_OFFSET
+    return max(peak, info.currsize), info.hits + hits, info.misses + misses
+
+
+def clear_dp_cache():
+    """
+    Clears pascal_dp during a timed run without losing its stats
+    """
+    global CACHE_OFFSET
+    CACHE_OFFSET = dp_cache_footprint()  # counters restart at zero after the clear
+    pascal_dp.cache_clear()
+
+
+def load_profile_call() -> Callable:
+    """
+    Imports profile_call from Implementation/profiling.py, only needed with --profile.
+    The folder is appended to the path so this folder's own files still come first.
+
+    Returns:
+        the profile_call function
+    """
+    if PROFILING_DIR not in sys.path:
+        sys.path.append(PROFILING_DIR)
+    from profiling import profile_call
+    return profile_call
+
+
+def run_and_time(func: Callable, n: int, print_it: bool = False,
+                 profile: str = None, profile_dir: str = ".",
+                 cache_mode: CacheMode = CacheMode.COLD):
     """
     Runs the pascal triangle generation, prints the row if requested
     and returns both the time and OPS used.
@@ -144,18 +199,39 @@ def run_and_time(func: Callable, n: int, print_it: bool = False):
         n (int): _description_
         algo (PascalType): _description_
         print (bool): _description_
+        profile (str): optional "cprofile" or "sample" mode, profiles only func(n)
+        profile_dir (str): directory for profile_<func>_<n>.pstats/.collapsed
+        cache_mode (CacheMode): pascal_dp cache state, the cache is always
+                                cleared and WARM refills it before timing
     """
-    global OPS
+    global OPS, CACHE_MODE, CACHE_OFFSET
+    pascal_dp.cache_clear()
+    if cache_mode == CacheMode.WARM:
+        recursive_pascal(n, func=pascal_dp)
+    info = pascal_dp.cache_info()
+    CACHE_OFFSET = (0, -info.hits, -info.misses)  # count the timed run only
     OPS = 0  # reset it
-    start = time.perf_counter()
-    result = func(n)
-    end = time.perf_counter()
+    if profile:
+        profile_call = load_profile_call()
+    previous_mode, CACHE_MODE = CACHE_MODE, cache_mode  # only for this run
+    try:
+        if profile:
+            out_prefix = os.path.join(profile_dir, f"profile_{func.__name__}_{n}")
+            result, elapsed = profile_call(func, n, profile, out_prefix)  # excludes writing the files
+        else:
+            start = time.perf_counter()
+            result = func(n)
+            elapsed = time.perf_counter() - start
+    finally:
+        CACHE_MODE = previous_mode
     if print_it:
         print(result)
-    return end - start, OPS
+    return elapsed, OPS
 
 
-def main(n: int, algo: PascalType, print_it: bool):
+def main(n: int, algo: PascalType, print_it: bool,
+         profile: str = None, profile_dir: str = ".",
+         cache_mode: CacheMode = CacheMode.COLD, cache_report: bool = False):
     """
     Prints the string the Nth row/ generates the nth row of the pascal triangle.
 
@@ -163,28 +239,38 @@ def main(n: int, algo: PascalType, print_it: bool):
         algo:
         print_type:
         n: the nth row to generate
+        profile: optional profiling mode passed to run_and_time
+        profile_dir: directory to write profiles to
+        cache_mode: pascal_dp cache state to measure in
+        cache_report: print a cache,mode,entries,hits,misses line after the CSV line
     """
+    cache = None
     if algo == PascalType.RECURSIVE:
         print("Recursive Version")
-        time, ops = run_and_time(pascal_r_full, n, print_it)
+        time, ops = run_and_time(pascal_r_full, n, print_it, profile=profile, profile_dir=profile_dir)
         print(f"Time: {time}({ops})")
     elif algo == PascalType.DP:
         print("Dynamic Programming Version")
-        time, ops = run_and_time(pascal_dp_full, n, print_it)
+        time, ops = run_and_time(pascal_dp_full, n, print_it, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
         print(f"Time: {time}({ops})")
     elif algo == PascalType.ITERATIVE_DP_TOGETHER:
-        time, ops = run_and_time(iterative_pascal, n)
-        time2, ops2 = run_and_time(pascal_dp_full, n)
+        time, ops = run_and_time(iterative_pascal, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(pascal_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
         print(f"{time:0.6f},{ops},{time2:0.6f},{ops2},-,-")
     elif algo == PascalType.ALL:
-        time, ops = run_and_time(iterative_pascal, n)
-        time2, ops2 = run_and_time(pascal_dp_full, n)
-        time3, ops3 = run_and_time(pascal_r_full, n)
+        time, ops = run_and_time(iterative_pascal, n, profile=profile, profile_dir=profile_dir)
+        time2, ops2 = run_and_time(pascal_dp_full, n, profile=profile, profile_dir=profile_dir, cache_mode=cache_mode)
+        cache = dp_cache_footprint()
+        time3, ops3 = run_and_time(pascal_r_full, n, profile=profile, profile_dir=profile_dir)
         print(f"{time:0.6f},{ops},{time2:0.6f},{ops2},{time3:0.6f},{ops3}")
     else:
         print("Iterative Version")
-        time, ops = run_and_time(iterative_pascal, n, print_it)
+        time, ops = run_and_time(iterative_pascal, n, print_it, profile=profile, profile_dir=profile_dir)
         print(f"Time: {time}({ops})")
+    if cache_report and cache is not None:
+        print(f"cache,{cache_mode.value},{cache[0]},{cache[1]},{cache[2]}")
 
 
 if __name__ == "__main__":
@@ -200,7 +286,23 @@ if __name__ == "__main__":
         default=PascalType.ITERATIVE.value,
         help="The type of algorithm to use: 0 = iterative, 1 = recursive, 2 = dp, 3 = all, 4 = iterative and dp together",
     )
+    parser.add_argument(
+        "--cache", choices=[mode.value for mode in CacheMode], default=CacheMode.COLD.value,
+        help="pascal_dp cache state: cold, warm or per-call"
+    )
+    parser.add_argument(
+        "--cache-report", action="store_true", default=False,
+        help="print a cache,mode,entries,hits,misses line after the results"
+    )
+    parser.add_argument(
+        "--profile", choices=PROFILE_MODES, default=None,
+        help="profile the measured call: cprofile = deterministic, sample = sampling"
+    )
+    parser.add_argument(
+        "--profile-dir", type=str, default=".", help="directory for the profile files"
+    )
 
     args = parser.parse_args()
     algo = PascalType(args.algo)
-    main(args.n, algo, args.print)
+    main(args.n, algo, args.print, args.profile, args.profile_dir,
+         CacheMode(args.cache), args.cache_report)